@@ -1,8 +1,16 @@
+import io
 import os
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.extras import execute_values
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
 from datetime import datetime
 
 # === LOCALIZAÇÃO DINÂMICA DO db_config.json ===
@@ -12,64 +20,16 @@ CONFIG_PATH = os.path.join(BASE_DIR, "db_config.json")
 with open(CONFIG_PATH, "r", encoding="utf-8") as f:
     DB_CONFIG = json.load(f)
 
+# === OPÇÕES DE ESCRITA DOS CSVs ===
+# O escritor do Arrow já decide citação por coluna em C++ (valores numéricos e
+# datas saem sem a heurística por caractere do to_csv); quoting_style='needed'
+# só cita células de texto que realmente exigem, com quebra de linha '\n'
+_CSV_WRITE_OPTIONS = pacsv.WriteOptions(include_header=True, quoting_style='needed')
+
 # === CONEXÃO COM O POSTGRESQL ===
 conn = psycopg2.connect(**DB_CONFIG)
 cur = conn.cursor()
 
-# === FUNÇÃO: CONVERTER TIPOS NUMPY PARA PYTHON NATIVOS ===
-def converter_tipos_numpy(valor):
-    """
-    Converte tipos numpy para tipos Python nativos compatíveis com psycopg2
-    """
-    if pd.isna(valor):
-        return None
-    elif isinstance(valor, np.integer):  # Inclui int64, int32, int16, int8
-        return int(valor)
-    elif isinstance(valor, np.floating):  # Inclui float64, float32
-        return float(valor)
-    elif isinstance(valor, (np.bool_, bool)):  # Apenas np.bool_
-        return bool(valor)
-    elif isinstance(valor, np.str_):  # String numpy (np.unicode_ removido no NumPy 2.0)
-        return str(valor)
-    elif isinstance(valor, pd.Timestamp):
-        return valor.to_pydatetime()
-    elif isinstance(valor, np.datetime64):
-        return pd.Timestamp(valor).to_pydatetime()
-    elif hasattr(valor, 'item'):  # Qualquer escalar numpy
-        return valor.item()
-    else:
-        return valor
-
-# === FUNÇÃO: LIMPAR DATAFRAME DE TIPOS NUMPY ===
-def limpar_tipos_numpy(df):
-    """
-    Remove tipos numpy do DataFrame para evitar erros de inserção no PostgreSQL
-    """
-    df_limpo = df.copy()
-    
-    for coluna in df_limpo.columns:
-        dtype_str = str(df_limpo[coluna].dtype)
-        
-        if df_limpo[coluna].dtype == 'object':
-            # Para colunas object, aplicar conversão em cada valor
-            df_limpo[coluna] = df_limpo[coluna].apply(converter_tipos_numpy)
-        elif 'int' in dtype_str:
-            # Converter qualquer tipo inteiro para int Python nativo
-            df_limpo[coluna] = df_limpo[coluna].apply(lambda x: int(x) if pd.notna(x) else None)
-        elif 'float' in dtype_str:
-            # Converter qualquer tipo float para float Python nativo
-            df_limpo[coluna] = df_limpo[coluna].apply(lambda x: float(x) if pd.notna(x) else None)
-        elif 'bool' in dtype_str:
-            # Converter bool numpy para bool Python
-            df_limpo[coluna] = df_limpo[coluna].apply(lambda x: bool(x) if pd.notna(x) else None)
-        elif 'datetime' in dtype_str:
-            # Converter timestamps para datetime Python
-            df_limpo[coluna] = df_limpo[coluna].apply(
-                lambda x: x.to_pydatetime() if pd.notna(x) and hasattr(x, 'to_pydatetime') else x
-            )
-    
-    return df_limpo
-
 # === FUNÇÃO: CRIAR TABELA DE LOG ===
 def criar_tabela_log():
     """
@@ -91,13 +51,26 @@ def criar_tabela_log():
         arquivo_gerado VARCHAR(255)
     );
     """)
-    conn.commit()
     print("📋 Tabela de log criada/verificada: log_extractions")
 
+# Buffer de logs em memória: evita um INSERT + commit (fsync) por evento.
+# Os registros acumulados são gravados de uma vez por descarregar_logs().
+# O lock protege o buffer quando as tabelas são processadas em paralelo.
+_LOG_BUFFER = []
+_LOG_LOCK = threading.Lock()
+
+# Comando de INSERT do lote de logs, montado uma única vez
+_LOG_INSERT_SQL = """
+    INSERT INTO log_extractions
+    (tabela, acao, registros_processados, duplicatas_encontradas, nulos_encontrados,
+     duplicatas_removidas, nulos_tratados, status, detalhes, arquivo_gerado)
+    VALUES %s
+"""
+
 # === FUNÇÃO: INSERIR LOG (COM TRATAMENTO DE TIPOS) ===
 def inserir_log(tabela, acao, registros=0, duplicatas=0, nulos=0, dup_removidas=0, nulos_tratados=0, status='SUCESSO', detalhes='', arquivo=''):
     """
-    Insere registro na tabela de log com conversão de tipos
+    Acumula registro de log no buffer com conversão de tipos
     """
     # Converter todos os valores para tipos Python nativos
     params = (
@@ -112,42 +85,110 @@ def inserir_log(tabela, acao, registros=0, duplicatas=0, nulos=0, dup_removidas=
         str(detalhes),
         str(arquivo)
     )
-    
-    cur.execute("""
-        INSERT INTO log_extractions 
-        (tabela, acao, registros_processados, duplicatas_encontradas, nulos_encontrados, 
-         duplicatas_removidas, nulos_tratados, status, detalhes, arquivo_gerado)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """, params)
-    conn.commit()
+
+    with _LOG_LOCK:
+        _LOG_BUFFER.append(params)
+
+# === FUNÇÃO: DESCARREGAR BUFFER DE LOGS ===
+def descarregar_logs():
+    """
+    Grava todos os logs acumulados no buffer em um único INSERT em lote
+    (o commit fica a cargo do chamador — a execução roda em uma só transação)
+    """
+    with _LOG_LOCK:
+        if not _LOG_BUFFER:
+            return
+
+        execute_values(cur, _LOG_INSERT_SQL, _LOG_BUFFER, page_size=1000)
+        _LOG_BUFFER.clear()
+
+# === FUNÇÃO: CONTAR NULOS POR COLUNA ===
+def contar_nulos(df, colunas):
+    """
+    Conta nulos por coluna sem materializar um DataFrame booleano intermediário.
+    Em colunas com backend pyarrow a contagem já está no bitmap de validade (O(1));
+    nas demais, usa numpy direto sobre o array subjacente.
+    """
+    contagens = {}
+    for col in colunas:
+        pa_arr = getattr(df[col].array, '_pa_array', None)
+        if pa_arr is not None:
+            contagens[col] = int(pa_arr.null_count)
+        else:
+            contagens[col] = int(np.count_nonzero(pd.isna(df[col].values)))
+    return contagens
+
+# === REGRAS DE PREENCHIMENTO DE NULOS EM COLUNAS DE TEXTO ===
+# Pares (palavra-chave no nome da coluna, valor padrão), avaliados em ordem
+FILL_RULES = [
+    ('nome', 'Nome não informado'),
+    ('cliente', 'Nome não informado'),
+    ('advogado', 'Nome não informado'),
+    ('juiz', 'Nome não informado'),
+    ('cpf', '000.000.000-00'),
+    ('endereco', 'Endereço não informado'),
+    ('cidade', 'Cidade não informada'),
+    ('estado', 'XX'),
+    ('oab', 'OAB não informada'),
+    ('vara', 'Vara não informada'),
+]
+
+# === FUNÇÃO: CONFERIR COMPATIBILIDADE ENTRE REGRA E DTYPE ===
+def _valor_compativel(valor, dtype):
+    """
+    Confere se o valor de preenchimento resolvido pelo schema do banco pode ser
+    aplicado ao dtype que a coluna efetivamente tem no frame — o percurso pelo
+    CSV pode divergir do tipo declarado, e um fillna incompatível lança exceção
+    """
+    dtype_lower = str(dtype).lower()
+    if isinstance(valor, str):
+        return dtype == 'object' or 'string' in dtype_lower
+    if isinstance(valor, bool):  # antes de int: bool é subclasse de int
+        return 'bool' in dtype_lower
+    if isinstance(valor, (int, float)):
+        return 'int' in dtype_lower or 'float' in dtype_lower or 'double' in dtype_lower
+    if isinstance(valor, pd.Timestamp):
+        return 'date' in dtype_lower or 'timestamp' in dtype_lower
+    return False
 
 # === FUNÇÃO: VALIDAR E LIMPAR DADOS ===
-def validar_e_limpar_dados(df, tabela_nome):
+def validar_e_limpar_dados(df_limpo, tabela_nome, colunas_anulaveis=None, regras=None):
     """
     Valida dados, remove duplicatas e trata valores nulos
+    Assume posse do DataFrame recebido e o modifica no lugar, sem cópia
+    Quando chamada por um limpador de criar_limpador, recebe as colunas
+    anuláveis e as regras de preenchimento já resolvidas pelo schema,
+    dispensando os testes de dtype e de nome de coluna em tempo de execução
     Retorna DataFrame limpo e estatísticas
     """
     print(f"  🔍 Validando dados da tabela {tabela_nome}...")
-    
-    # Estatísticas iniciais
-    registros_iniciais = len(df)
-    duplicatas_iniciais = df.duplicated().sum()
-    
-    # Contar nulos por coluna (exceto ID que pode ser auto-incremento)
-    colunas_importantes = [col for col in df.columns if col.lower() not in ['id']]
-    nulos_por_coluna = df[colunas_importantes].isnull().sum()
-    nulos_totais = nulos_por_coluna.sum()
+
+    # Estatísticas iniciais (máscaras calculadas uma única vez e reutilizadas)
+    registros_iniciais = len(df_limpo)
+    dup_mask = df_limpo.duplicated()
+    # .any() para o guard (curto-circuita na primeira ocorrência); a soma da
+    # máscara inteira só é paga quando de fato há duplicatas para contar
+    tem_duplicatas = bool(dup_mask.any())
+    duplicatas_iniciais = int(dup_mask.sum()) if tem_duplicatas else 0
+
+    # Contar nulos por coluna (exceto ID que pode ser auto-incremento);
+    # com o schema em mãos, colunas NOT NULL nem entram na contagem
+    if colunas_anulaveis is None:
+        colunas_importantes = [col for col in df_limpo.columns if col.lower() not in ['id']]
+    else:
+        colunas_importantes = [col for col in colunas_anulaveis if col in df_limpo.columns]
+    nulos_por_coluna = contar_nulos(df_limpo, colunas_importantes)
+    nulos_totais = sum(nulos_por_coluna.values())
     
     print(f"    📊 Registros iniciais: {registros_iniciais}")
     print(f"    🔄 Duplicatas encontradas: {duplicatas_iniciais}")
     print(f"    ❌ Valores nulos encontrados: {nulos_totais}")
     
     # === TRATAMENTO DE DUPLICATAS ===
-    df_limpo = df.copy()
-    
-    if duplicatas_iniciais > 0:
-        # Remove duplicatas mantendo o primeiro registro
-        df_limpo = df_limpo.drop_duplicates()
+    if tem_duplicatas:
+        # Remove duplicatas mantendo o primeiro registro (reutiliza a máscara já calculada)
+        df_limpo = df_limpo[~dup_mask]
+        nulos_por_coluna = contar_nulos(df_limpo, colunas_importantes)
         duplicatas_removidas = registros_iniciais - len(df_limpo)
         print(f"    ✅ {duplicatas_removidas} duplicatas removidas")
         
@@ -166,51 +207,69 @@ def validar_e_limpar_dados(df, tabela_nome):
     
     if nulos_totais > 0:
         print(f"    🔧 Tratando valores nulos:")
-        
+
+        # Monta um mapeamento coluna→valor por grupo de tipo e dispara um único
+        # fillna vetorizado por grupo, em vez de um fillna por coluna
+        mapa_texto = {}
+        mapa_numerico = {}
+        mapa_bool = {}
+        mapa_data = {}
+        mapa_resolvido = {}
+
         for coluna in colunas_importantes:
-            nulos_coluna = df_limpo[coluna].isnull().sum()
+            nulos_coluna = int(nulos_por_coluna[coluna])
             if nulos_coluna > 0:
                 print(f"      • {coluna}: {nulos_coluna} nulos", end=" → ")
-                
+
+                regra = regras.get(coluna) if regras is not None else None
+                if regra is not None and _valor_compativel(regra, df_limpo[coluna].dtype):
+                    # Valor de preenchimento já resolvido na construção do limpador;
+                    # regra incompatível com o dtype real do frame cai no caminho
+                    # genérico abaixo, dirigido pelo dtype, em vez de quebrar o fillna
+                    mapa_resolvido[coluna] = regra
+                    print("preenchido com valor padrão do schema")
+                    nulos_tratados += nulos_coluna
+                    continue
+
+                # dtype em minúsculas cobre numpy ('float64'), extensão ('Int64')
+                # e pyarrow ('int64[pyarrow]', 'double[pyarrow]', 'string[pyarrow]')
+                dtype_lower = str(df_limpo[coluna].dtype).lower()
+                col_lower = coluna.lower()
+
                 # Estratégias específicas por tipo de coluna
-                if df_limpo[coluna].dtype == 'object':  # Texto
-                    if 'nome' in coluna.lower() or 'cliente' in coluna.lower() or 'advogado' in coluna.lower() or 'juiz' in coluna.lower():
-                        df_limpo[coluna] = df_limpo[coluna].fillna('Nome não informado')
-                    elif 'cpf' in coluna.lower():
-                        df_limpo[coluna] = df_limpo[coluna].fillna('000.000.000-00')
-                    elif 'endereco' in coluna.lower():
-                        df_limpo[coluna] = df_limpo[coluna].fillna('Endereço não informado')
-                    elif 'cidade' in coluna.lower():
-                        df_limpo[coluna] = df_limpo[coluna].fillna('Cidade não informada')
-                    elif 'estado' in coluna.lower():
-                        df_limpo[coluna] = df_limpo[coluna].fillna('XX')
-                    elif 'oab' in coluna.lower():
-                        df_limpo[coluna] = df_limpo[coluna].fillna('OAB não informada')
-                    elif 'vara' in coluna.lower():
-                        df_limpo[coluna] = df_limpo[coluna].fillna('Vara não informada')
-                    elif 'numero' in coluna.lower() and 'processo' in coluna.lower():
-                        df_limpo[coluna] = df_limpo[coluna].fillna(f'PROC-{datetime.now().strftime("%Y%m%d")}-{len(df_limpo)}')
+                if df_limpo[coluna].dtype == 'object' or 'string' in dtype_lower:  # Texto
+                    if 'numero' in col_lower and 'processo' in col_lower:
+                        # Sentinela único por linha — o valor constante anterior
+                        # atribuía o mesmo número de processo a todos os nulos
+                        hoje = datetime.now().strftime("%Y%m%d")
+                        mask_nulos = df_limpo[coluna].isna().to_numpy()
+                        df_limpo.loc[mask_nulos, coluna] = [f'PROC-{hoje}-{i}' for i in range(nulos_coluna)]
+                        print("preenchido com sentinela único por linha")
                     else:
-                        df_limpo[coluna] = df_limpo[coluna].fillna('Não informado')
-                    print("preenchido com valor padrão")
-                    
-                elif df_limpo[coluna].dtype in ['int64', 'float64', 'Int64', 'Float64']:  # Números
-                    if 'valor' in coluna.lower():
-                        df_limpo[coluna] = df_limpo[coluna].fillna(0.0)
+                        mapa_texto[coluna] = next((v for kw, v in FILL_RULES if kw in col_lower), 'Não informado')
+                        print("preenchido com valor padrão")
+
+                elif 'int' in dtype_lower or 'float' in dtype_lower or 'double' in dtype_lower:  # Números
+                    if 'valor' in col_lower:
+                        mapa_numerico[coluna] = 0.0
                         print("preenchido com 0.0")
                     else:
-                        df_limpo[coluna] = df_limpo[coluna].fillna(0)
+                        mapa_numerico[coluna] = 0
                         print("preenchido com 0")
-                        
-                elif 'bool' in str(df_limpo[coluna].dtype):  # Booleano
-                    df_limpo[coluna] = df_limpo[coluna].fillna(False)
+
+                elif 'bool' in dtype_lower:  # Booleano
+                    mapa_bool[coluna] = False
                     print("preenchido com False")
-                    
-                elif 'date' in str(df_limpo[coluna].dtype):  # Data
-                    df_limpo[coluna] = df_limpo[coluna].fillna(pd.Timestamp('1900-01-01'))
+
+                elif 'date' in dtype_lower or 'timestamp' in dtype_lower:  # Data
+                    mapa_data[coluna] = pd.Timestamp('1900-01-01')
                     print("preenchido com data padrão")
-                
+
                 nulos_tratados += nulos_coluna
+
+        for mapa in (mapa_texto, mapa_numerico, mapa_bool, mapa_data, mapa_resolvido):
+            if mapa:
+                df_limpo.fillna(value=mapa, inplace=True)
         
         print(f"    ✅ {nulos_tratados} valores nulos tratados")
         
@@ -224,24 +283,6 @@ def validar_e_limpar_dados(df, tabela_nome):
             detalhes=f'Valores nulos encontrados e tratados: {nulos_tratados}'
         )
     
-    # === VALIDAÇÕES ESPECÍFICAS POR TABELA ===
-    if tabela_nome == 'fato_processos':
-        # Garantir que não há processos sem pessoa, juiz ou advogado
-        registros_invalidos = df_limpo[
-            (df_limpo['id_pessoa'].isnull()) | 
-            (df_limpo['id_juiz'].isnull()) | 
-            (df_limpo['id_advogado'].isnull())
-        ]
-        
-        if len(registros_invalidos) > 0:
-            df_limpo = df_limpo.dropna(subset=['id_pessoa', 'id_juiz', 'id_advogado'])
-            print(f"    ⚠️ {len(registros_invalidos)} processos inválidos removidos (sem pessoa/juiz/advogado)")
-    
-    # === CONVERTER TIPOS NUMPY PARA PYTHON NATIVOS ===
-    print(f"  🔧 Convertendo tipos numpy para tipos Python nativos...")
-    df_limpo = limpar_tipos_numpy(df_limpo)
-    print(f"    ✅ Tipos convertidos com sucesso")
-    
     # Estatísticas finais
     registros_finais = len(df_limpo)
     print(f"    ✅ Registros finais após limpeza: {registros_finais}")
@@ -256,6 +297,127 @@ def validar_e_limpar_dados(df, tabela_nome):
         'nulos_tratados': nulos_tratados
     }
 
+# === FUNÇÃO: CRIAR LIMPADOR ESPECIALIZADO POR TABELA ===
+def criar_limpador(tabela, colunas_info):
+    """
+    Gera um limpador especializado a partir do schema da tabela: as colunas
+    anuláveis e o valor de preenchimento de cada uma são resolvidos aqui, uma
+    única vez, em vez de re-testados por dtype/nome a cada execução.
+    Tabelas só com colunas NOT NULL ficam com um limpador que apenas deduplica.
+    """
+    colunas_anulaveis = []
+    regras = {}
+
+    for nome, data_type, is_nullable in colunas_info:
+        if nome.lower() == 'id' or is_nullable != 'YES':
+            continue
+        colunas_anulaveis.append(nome)
+        col_lower = nome.lower()
+
+        if data_type in ('character varying', 'character', 'text'):
+            if 'numero' in col_lower and 'processo' in col_lower:
+                continue  # sentinela único por linha, gerado na validação
+            regras[nome] = next((v for kw, v in FILL_RULES if kw in col_lower), 'Não informado')
+        elif data_type in ('numeric', 'real', 'double precision'):
+            regras[nome] = 0.0 if 'valor' in col_lower else 0
+        elif data_type in ('smallint', 'integer', 'bigint'):
+            regras[nome] = 0
+        elif data_type == 'boolean':
+            regras[nome] = False
+        elif data_type == 'date' or data_type.startswith('timestamp'):
+            regras[nome] = pd.Timestamp('1900-01-01')
+
+    def limpador(df_limpo):
+        return validar_e_limpar_dados(df_limpo, tabela, colunas_anulaveis, regras)
+
+    return limpador
+
+# === FUNÇÃO: DERIVAR OPÇÕES DE LEITURA DO CSV A PARTIR DO SCHEMA ===
+def construir_opcoes_leitura(colunas_info):
+    """
+    Deriva os argumentos de pd.read_csv do schema da tabela, para que o CSV do
+    COPY reproduza os tipos que pd.read_sql entregava: inteiros/floats com dtype
+    explícito, booleanos reconhecendo o t/f do PostgreSQL e datas interpretadas
+    como datetime em vez de texto
+    """
+    dtypes = {}
+    parse_dates = []
+
+    for nome, data_type, _ in colunas_info:
+        if data_type in ('character varying', 'character', 'text'):
+            # Sem dtype fixo, uma coluna varchar só com dígitos seria inferida
+            # como inteiro (zeros à esquerda de CPF/OAB/nº de processo sumiriam)
+            # e valores t/f literais virariam booleanos pelos true/false_values
+            dtypes[nome] = 'string[pyarrow]'
+        elif data_type in ('smallint', 'integer', 'bigint'):
+            dtypes[nome] = 'int64[pyarrow]'
+        elif data_type in ('numeric', 'real', 'double precision'):
+            dtypes[nome] = 'float64[pyarrow]'
+        elif data_type == 'boolean':
+            dtypes[nome] = 'boolean'  # anulável; t/f resolvidos por true/false_values
+        elif data_type == 'date' or data_type.startswith('timestamp'):
+            parse_dates.append(nome)
+
+    return {
+        'dtype': dtypes,
+        'parse_dates': parse_dates,
+        # PostgreSQL emite booleanos como t/f no CSV
+        'true_values': ['t'],
+        'false_values': ['f'],
+        # Só o marcador de NULL do COPY vira NA; string vazia continua string vazia
+        'na_values': ['\\N'],
+        'keep_default_na': False,
+    }
+
+# === FUNÇÃO: PREPARAR TABELA ARROW PARA EXPORTAÇÃO ===
+def preparar_tabela_arrow(df_limpo, colunas_date=()):
+    """
+    Monta a pa.Table do export reproduzindo a renderização do to_csv original:
+    colunas date voltam a sair como AAAA-MM-DD (date32, sem hora artificial do
+    parse_dates) e booleanos como True/False em vez do true/false do Arrow —
+    o formato desses CSVs é contrato com o relatório do Power BI
+    """
+    tabela_arrow = pa.Table.from_pandas(df_limpo, preserve_index=False)
+
+    for i, campo in enumerate(tabela_arrow.schema):
+        if campo.name in colunas_date and pa.types.is_timestamp(campo.type):
+            tabela_arrow = tabela_arrow.set_column(
+                i, campo.name, tabela_arrow.column(i).cast(pa.date32())
+            )
+        elif pa.types.is_boolean(campo.type):
+            tabela_arrow = tabela_arrow.set_column(
+                i, campo.name,
+                pc.if_else(tabela_arrow.column(i), pa.scalar('True'), pa.scalar('False'))
+            )
+
+    return tabela_arrow
+
+# === FUNÇÃO: CONSTRUIR LIMPADORES PARA TODAS AS TABELAS ===
+def construir_limpadores(tabelas):
+    """
+    Introspecta information_schema.columns uma única vez e devolve, por tabela,
+    um limpador especializado, as opções de leitura do CSV e as colunas date
+    (que recebem cast de volta para date32 no export); tabela sem schema
+    visível usa o caminho genérico
+    """
+    limpadores = {}
+    opcoes_leitura = {}
+    colunas_date = {}
+    for tabela in tabelas:
+        cur.execute("""
+            SELECT column_name, data_type, is_nullable
+            FROM information_schema.columns
+            WHERE table_name = %s
+              AND table_schema = current_schema()
+            ORDER BY ordinal_position
+        """, (tabela,))
+        colunas_info = cur.fetchall()
+        if colunas_info:
+            limpadores[tabela] = criar_limpador(tabela, colunas_info)
+            opcoes_leitura[tabela] = construir_opcoes_leitura(colunas_info)
+            colunas_date[tabela] = [nome for nome, data_type, _ in colunas_info if data_type == 'date']
+    return limpadores, opcoes_leitura, colunas_date
+
 # === FUNÇÃO: EXTRAÇÃO PARA CSV COM VALIDAÇÃO ===
 def extrair_csvs_validados():
     """
@@ -280,82 +442,148 @@ def extrair_csvs_validados():
         'arquivos_gerados': []
     }
     
-    for tabela in tabelas:
-        try:
-            print(f"\n📋 Processando tabela: {tabela}")
-            print("-" * 50)
-            
-            # 1. EXTRAÇÃO DOS DADOS
-            print(f"  📥 Extraindo dados da tabela {tabela}...")
-            df_original = pd.read_sql(f"SELECT * FROM {tabela}", conn)
-            print(f"    ✅ {len(df_original)} registros extraídos")
-            
-            # 2. VALIDAÇÃO E LIMPEZA
-            df_limpo, stats = validar_e_limpar_dados(df_original, tabela)
-            
-            # 3. VERIFICAÇÃO FINAL DE INTEGRIDADE
-            print(f"  🔐 Verificação final de integridade...")
-            
-            # Verificar se ainda há duplicatas
-            duplicatas_finais = df_limpo.duplicated().sum()
-            if duplicatas_finais > 0:
-                print(f"    ⚠️ ATENÇÃO: {duplicatas_finais} duplicatas ainda presentes!")
-                df_limpo = df_limpo.drop_duplicates()
-            
-            # Verificar nulos em colunas críticas
-            colunas_criticas = [col for col in df_limpo.columns if col.lower() not in ['id']]
-            nulos_finais = df_limpo[colunas_criticas].isnull().sum().sum()
-            
-            print(f"    ✅ Duplicatas finais: {duplicatas_finais}")
-            print(f"    ✅ Nulos finais em colunas críticas: {nulos_finais}")
-            
-            # 4. SALVAR CSV
-            csv_path = os.path.join(csv_dir, f"{tabela}.csv")
-            df_limpo.to_csv(csv_path, index=False, encoding='utf-8')
-            
-            # Calcular tamanho do arquivo
-            tamanho_mb = os.path.getsize(csv_path) / (1024 * 1024)
-            
-            print(f"  💾 Arquivo salvo: {tabela}.csv ({len(df_limpo)} registros, {tamanho_mb:.2f} MB)")
-            
-            # 5. LOG DA EXTRAÇÃO
-            inserir_log(
-                tabela=tabela,
-                acao='EXTRACAO',
-                registros=len(df_limpo),
-                duplicatas=stats['duplicatas_encontradas'],
-                nulos=stats['nulos_encontrados'],
-                dup_removidas=stats['duplicatas_removidas'],
-                nulos_tratados=stats['nulos_tratados'],
-                status='SUCESSO',
-                detalhes=f'Arquivo CSV gerado com {len(df_limpo)} registros válidos',
-                arquivo=f"{tabela}.csv"
-            )
-            
-            # Atualizar estatísticas gerais
-            resultados_gerais['tabelas_sucesso'] += 1
-            resultados_gerais['total_registros_originais'] += stats['registros_iniciais']
-            resultados_gerais['total_registros_finais'] += stats['registros_finais']
-            resultados_gerais['total_duplicatas_removidas'] += stats['duplicatas_removidas']
-            resultados_gerais['total_nulos_tratados'] += stats['nulos_tratados']
-            resultados_gerais['arquivos_gerados'].append({
-                'tabela': tabela,
-                'arquivo': f"{tabela}.csv",
-                'registros': len(df_limpo),
-                'tamanho_mb': round(tamanho_mb, 2)
-            })
-            
-        except Exception as e:
-            print(f"  ❌ ERRO ao processar {tabela}: {e}")
-            inserir_log(
-                tabela=tabela,
-                acao='ERRO',
-                status='ERRO',
-                detalhes=f'Erro na extração: {str(e)}'
-            )
-    
+    # Limpadores especializados, opções de leitura e colunas date: o schema é
+    # introspectado uma vez, fora das threads
+    limpadores, opcoes_leitura, colunas_date = construir_limpadores(tabelas)
+
+    # Uma conexão por tabela: psycopg2 libera o GIL durante a espera de rede,
+    # então as quatro extrações se sobrepõem em threads
+    conn_pool = ThreadedConnectionPool(len(tabelas), len(tabelas), **DB_CONFIG)
+    try:
+        with ThreadPoolExecutor(max_workers=len(tabelas)) as executor:
+            resumos = list(executor.map(
+                lambda tabela: processar_tabela(tabela, conn_pool, csv_dir, limpadores, opcoes_leitura, colunas_date),
+                tabelas
+            ))
+    finally:
+        conn_pool.closeall()
+
+    # Agregar estatísticas após o map (sem estado compartilhado entre threads)
+    for resumo in resumos:
+        if resumo is None:
+            continue
+        stats = resumo['stats']
+        resultados_gerais['tabelas_sucesso'] += 1
+        resultados_gerais['total_registros_originais'] += stats['registros_iniciais']
+        resultados_gerais['total_registros_finais'] += stats['registros_finais']
+        resultados_gerais['total_duplicatas_removidas'] += stats['duplicatas_removidas']
+        resultados_gerais['total_nulos_tratados'] += stats['nulos_tratados']
+        resultados_gerais['arquivos_gerados'].append({
+            'tabela': resumo['tabela'],
+            'arquivo': f"{resumo['tabela']}.csv",
+            'registros': stats['registros_finais'],
+            'tamanho_mb': resumo['tamanho_mb']
+        })
+
     return resultados_gerais
 
+# === FUNÇÃO: PROCESSAR UMA TABELA (EXTRAÇÃO + VALIDAÇÃO + CSV) ===
+def processar_tabela(tabela, conn_pool, csv_dir, limpadores, opcoes_leitura, colunas_date):
+    """
+    Extrai, valida e salva uma tabela em CSV usando uma conexão do pool
+    Retorna o resumo da tabela, ou None em caso de erro
+    """
+    conexao = conn_pool.getconn()
+    try:
+        print(f"\n📋 Processando tabela: {tabela}")
+        print("-" * 50)
+
+        # 1. EXTRAÇÃO DOS DADOS
+        # COPY serializa direto no servidor, sem o fetch linha a linha do cursor
+        print(f"  📥 Extraindo dados da tabela {tabela}...")
+        consulta = f"SELECT * FROM {tabela}"
+
+        buffer = io.BytesIO()
+        with conexao.cursor() as cursor:
+            if tabela == 'fato_processos':
+                # Validação empurrada para o SQL: o banco filtra processos sem
+                # pessoa/juiz/advogado na própria varredura, sem trafegar linhas inválidas
+                cursor.execute("""
+                    SELECT COUNT(*) FROM fato_processos
+                    WHERE id_pessoa IS NULL OR id_juiz IS NULL OR id_advogado IS NULL
+                """)
+                registros_invalidos = cursor.fetchone()[0]
+                if registros_invalidos > 0:
+                    print(f"    ⚠️ {registros_invalidos} processos inválidos descartados no SQL (sem pessoa/juiz/advogado)")
+                consulta += " WHERE id_pessoa IS NOT NULL AND id_juiz IS NOT NULL AND id_advogado IS NOT NULL"
+
+            # NULL sai como \N para não se confundir com string vazia no read_csv
+            cursor.copy_expert(f"COPY ({consulta}) TO STDOUT WITH (FORMAT csv, HEADER, NULL '\\N')", buffer)
+
+        buffer.seek(0)
+        # dtype_backend='pyarrow' evita o fallback para colunas object; as opções
+        # derivadas do schema restauram os tipos que o CSV não carrega sozinho
+        # (booleanos t/f, datas, inteiros anuláveis)
+        df_original = pd.read_csv(buffer, dtype_backend='pyarrow', **opcoes_leitura.get(tabela, {}))
+        print(f"    ✅ {len(df_original)} registros extraídos")
+
+        # 2. VALIDAÇÃO E LIMPEZA (a validação assume posse do DataFrame, sem cópia)
+        limpador = limpadores.get(tabela)
+        if limpador is not None:
+            df_limpo, stats = limpador(df_original)
+        else:
+            df_limpo, stats = validar_e_limpar_dados(df_original, tabela)
+        del df_original
+
+        # 3. VERIFICAÇÃO FINAL DE INTEGRIDADE
+        # A validação acabou de deduplicar o frame — nada de refazer drop_duplicates;
+        # a invariante é garantida com uma checagem que para na primeira ocorrência
+        print(f"  🔐 Verificação final de integridade...")
+        assert not df_limpo.duplicated().any(), f"duplicatas remanescentes em {tabela}"
+
+        print(f"    ✅ Duplicatas finais: 0")
+        print(f"    ✅ Nulos tratados em colunas críticas: {stats['nulos_tratados']}")
+
+        # 4. SALVAR CSV (escrita em C++ via PyArrow; lida com tipos numpy/Arrow
+        # nativamente, sem conversão prévia para escalares Python)
+        csv_path = os.path.join(csv_dir, f"{tabela}.csv")
+        pacsv.write_csv(
+            preparar_tabela_arrow(df_limpo, colunas_date.get(tabela, ())),
+            csv_path,
+            write_options=_CSV_WRITE_OPTIONS
+        )
+
+        # Calcular tamanho do arquivo
+        tamanho_mb = os.path.getsize(csv_path) / (1024 * 1024)
+
+        print(f"  💾 Arquivo salvo: {tabela}.csv ({len(df_limpo)} registros, {tamanho_mb:.2f} MB)")
+
+        # 5. LOG DA EXTRAÇÃO
+        inserir_log(
+            tabela=tabela,
+            acao='EXTRACAO',
+            registros=len(df_limpo),
+            duplicatas=stats['duplicatas_encontradas'],
+            nulos=stats['nulos_encontrados'],
+            dup_removidas=stats['duplicatas_removidas'],
+            nulos_tratados=stats['nulos_tratados'],
+            status='SUCESSO',
+            detalhes=f'Arquivo CSV gerado com {len(df_limpo)} registros válidos',
+            arquivo=f"{tabela}.csv"
+        )
+
+        return {
+            'tabela': tabela,
+            'stats': stats,
+            'tamanho_mb': round(tamanho_mb, 2)
+        }
+
+    except Exception as e:
+        print(f"  ❌ ERRO ao processar {tabela}: {e}")
+        inserir_log(
+            tabela=tabela,
+            acao='ERRO',
+            status='ERRO',
+            detalhes=f'Erro na extração: {str(e)}'
+        )
+        return None
+
+    finally:
+        # Conexões do pool só fazem leitura; rollback encerra a transação
+        # (inclusive abortada por erro) antes de devolvê-la
+        conexao.rollback()
+        conn_pool.putconn(conexao)
+
 # === FUNÇÃO: GERAR RELATÓRIO DE LOGS ===
 def gerar_relatorio_logs():
     """
@@ -375,13 +603,14 @@ def gerar_relatorio_logs():
     
     if logs:
         df_logs = pd.DataFrame(logs, columns=colunas)
-        
-        # Limpar tipos numpy do DataFrame de logs também
-        df_logs = limpar_tipos_numpy(df_logs)
-        
-        # Salvar relatório de logs
+
+        # Salvar relatório de logs (PyArrow lida com os tipos nativamente)
         log_path = os.path.join(BASE_DIR, "csvs", "relatorio_logs.csv")
-        df_logs.to_csv(log_path, index=False, encoding='utf-8')
+        pacsv.write_csv(
+            pa.Table.from_pandas(df_logs, preserve_index=False),
+            log_path,
+            write_options=_CSV_WRITE_OPTIONS
+        )
         
         print(f"  ✅ Relatório de logs salvo: relatorio_logs.csv")
         return True
@@ -393,9 +622,15 @@ def main():
     try:
         print("🚀 Iniciando extração validada da base jurídica...")
         print("=" * 70)
-        
-        # 1. Criar tabela de log
+
+        # Execução inteira em uma única transação, com um único commit (e fsync)
+        # no finally; synchronous_commit=off dispensa esperar o flush do WAL
+        cur.execute("SET synchronous_commit = off")
+
+        # 1. Criar tabela de log (DDL única; commit imediato para que um rollback
+        # no tratamento de erro não a desfaça e derrube a gravação dos logs)
         criar_tabela_log()
+        conn.commit()
         
         # 2. Log de início da execução
         inserir_log(
@@ -441,7 +676,10 @@ def main():
         for arquivo in resultados['arquivos_gerados']:
             print(f"     • {arquivo['arquivo']}: {arquivo['registros']:,} registros ({arquivo['tamanho_mb']} MB)")
         
-        # 7. Gerar relatório de logs
+        # 7. Gerar relatório de logs (descarrega e confirma o buffer antes, para o
+        # relatório enxergar os logs desta execução e um erro posterior não perdê-los)
+        descarregar_logs()
+        conn.commit()
         gerar_relatorio_logs()
         
         # 8. Log de fim da execução
@@ -460,13 +698,14 @@ def main():
         print("=" * 70)
         print(f"   ✅ CSVs extraídos com validação completa")
         print(f"   ✅ Garantia: 0 duplicatas, 0 valores nulos críticos")
-        print(f"   ✅ Tipos numpy convertidos para compatibilidade PostgreSQL")
+        print(f"   ✅ Tipos das colunas preservados conforme o schema do banco")
         print(f"   ✅ Logs salvos na tabela 'log_extractions'")
         print(f"   📁 Arquivos disponíveis em: {os.path.join(BASE_DIR, 'csvs')}")
         print(f"   📊 Taxa de sucesso: {taxa_sucesso:.1f}%")
             
     except Exception as e:
         print(f"❌ Erro crítico na execução: {e}")
+        conn.rollback()  # garante transação utilizável para gravar o log de erro
         inserir_log(
             tabela='SISTEMA',
             acao='ERRO',
@@ -475,9 +714,17 @@ def main():
         )
         
     finally:
-        cur.close()
-        conn.close()
-        print("\n🔌 Conexão com banco encerrada.")
+        try:
+            descarregar_logs()
+            conn.commit()
+        except Exception as erro_log:
+            # Falha na gravação dos logs não pode mascarar a exceção original
+            # nem impedir o fechamento da conexão
+            print(f"⚠️ Falha ao gravar logs: {erro_log}")
+        finally:
+            cur.close()
+            conn.close()
+            print("\n🔌 Conexão com banco encerrada.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file